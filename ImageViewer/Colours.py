@@ -0,0 +1,8 @@
+from PySide6.QtGui import QColor, QPen
+from PySide6.QtCore import Qt
+
+DODGER_BLUE = QColor(30, 144, 255, 255)
+DODGER_BLUE_50PC = QColor(30, 144, 255, 128)
+
+# Pen for the video position line
+WHITE_PEN = QPen(QColor(Qt.GlobalColor.white))
@@ -1,45 +1,96 @@
-from PySide6.QtGui import QColor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Final, Optional
 
-ZOOM_SCALE_FACTOR = 1.05
+ZOOM_SCALE_FACTOR: Final = 1.05
 
-START_X = 300
-START_Y = 100
-START_WIDTH = 1024
-START_HEIGHT = 768
-MIN_WIDTH = START_WIDTH
+START_X: Final = 300
+START_Y: Final = 100
+START_WIDTH: Final = 1024
+START_HEIGHT: Final = 768
+MIN_WIDTH: Final = START_WIDTH
 
-DODGER_BLUE = QColor(30, 144, 255, 255)
-DODGER_BLUE_50PC = QColor(30, 144, 255, 128)
+# The single registry of supported file types, keyed by extension and giving the name and kind of each
+FILE_TYPES: Final = MappingProxyType({
+    '.gif': ('Graphics Interchange Format', 'image'),
+    '.jpg': ('JPG Image', 'image'),
+    '.jpeg': ('JPEG Image', 'image'),
+    '.png': ('Portable Network Graphic', 'image'),
+    '.webp': ('WEBP', 'image'),
+    '.mp4': ('MP4', 'video'),
+    '.mov': ('MOV', 'video'),
+})
 
 # List of supported image extensions
-IMAGE_EXTENSIONS = {
-    'Graphics Interchange Format': '.gif',
-    'JPG Image': '.jpg',
-    'JPEG Image': '.jpeg',
-    'Portable Network Graphic': '.png',
-    'WEBP': '.webp',
-}
+IMAGE_EXTENSIONS: Final = MappingProxyType({name: ext for ext, (name, kind) in FILE_TYPES.items() if kind == 'image'})
 
 # List of supported video extensions
-VIDEO_EXTENSIONS = {
-    'MP4': '.mp4',
-    'MOV': '.mov',
-}
+VIDEO_EXTENSIONS: Final = MappingProxyType({name: ext for ext, (name, kind) in FILE_TYPES.items() if kind == 'video'})
 
 # Full list of supported extensions
-SUPPORTED_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
+SUPPORTED_EXTENSIONS: Final = MappingProxyType({name: ext for ext, (name, _) in FILE_TYPES.items()})
+
+# Lookup from a case folded extension to the kind of file it represents, compare against this
+# and the sets below using Path.suffix.casefold()
+EXT_TO_KIND: Final = MappingProxyType({ext.casefold(): kind for ext, (_, kind) in FILE_TYPES.items()})
+
+# Sets of the extensions for single hash lookups rather than scanning the dict values
+IMAGE_EXT_SET: Final[frozenset[str]] = frozenset(ext for ext, kind in EXT_TO_KIND.items() if kind == 'image')
+VIDEO_EXT_SET: Final[frozenset[str]] = frozenset(ext for ext, kind in EXT_TO_KIND.items() if kind == 'video')
+SUPPORTED_EXT_SET: Final[frozenset[str]] = frozenset(EXT_TO_KIND)
+
+# Name filters for QDir, built once rather than on every folder change (QDir matches these case insensitively)
+QT_NAME_FILTERS: Final = tuple(f'*{ext}' for ext in FILE_TYPES)
+
+@lru_cache(maxsize=64)
+def ExtensionKind(suffix: str) -> Optional[str]:
+    # Return 'image', 'video' or None for a file suffix, only a handful of suffixes are ever seen so this is cached
+    return EXT_TO_KIND.get(suffix.casefold())
 
 # Amount to skip video by
-VIDEO_SKIP_AMOUNT = 5000
+VIDEO_SKIP_AMOUNT: Final = 5000
 
 # Amount to adjust audio volume by
-AUDIO_ADJUST_AMOUNT = 0.1
+AUDIO_ADJUST_AMOUNT: Final = 0.1
 
 # Video UI margin
-VIDEO_UI_MARGIN = 100
+VIDEO_UI_MARGIN: Final = 100
 
 # Video position line size
-VIDEO_POSITION_LINE_SIZE = 4
+VIDEO_POSITION_LINE_SIZE: Final = 4
 
 # Video UI Timeout
-VIDEO_UI_TIMEOUT = 500
+VIDEO_UI_TIMEOUT: Final = 500
+
+# Minimum time between redraws of the video UI as the video plays, around 30 times a second (ms)
+VIDEO_UI_UPDATE_INTERVAL: Final = 33
+
+# Minimum time between updates of the selection rectangle as the mouse moves, around 60 times a second (ms)
+SELECTION_UPDATE_INTERVAL: Final = 16
+
+# Time to wait for the adjustment sliders to settle before previewing the change (ms)
+SLIDER_PREVIEW_INTERVAL: Final = 16
+
+# Maximum number of changes that can be undone
+UNDO_BUFFER_SIZE: Final = 16
+
+# Identical changes made within this time of each other are merged into a single entry in the undo buffer (ms)
+UNDO_COALESCE_INTERVAL: Final = 500
+
+# Time to wait after a merged change before converting the image for display, so a quick run is converted once (ms)
+PIXMAP_UPDATE_DELAY: Final = 50
+
+# Time to wait after the last colour, contrast or brightness step before applying the steps to the full image (ms)
+ADJUST_COMMIT_DELAY: Final = 200
+
+# zlib level used to compress images in the undo buffer, the fastest level as this runs on every change
+UNDO_COMPRESSION_LEVEL: Final = 1
+
+# Size of the pixmap cache used to hold the pixmaps of images in the undo buffer (KB)
+PIXMAP_CACHE_LIMIT: Final = 256 * 1024
+
+# Images up to this size are read into memory in one go before decoding (bytes)
+PRELOAD_SIZE_LIMIT: Final = 256 * 1024 * 1024
+
+# Images with more pixels than this are decoded in the background
+BACKGROUND_DECODE_PIXELS: Final = 4_000_000
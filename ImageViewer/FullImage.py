@@ -1,12 +1,18 @@
 from __future__ import annotations
+from collections import deque
+from itertools import count
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial, wraps
+from io import BytesIO
 from pathlib import Path
 from typing import Any, Callable, Optional
+import logging
 
-from PIL import Image
-from PIL.ImageQt import ImageQt
+from PIL import Image, ImageEnhance
 
 from PySide6.QtWidgets import (
+    QApplication,
     QGraphicsScene,
     QGraphicsView,
     QGraphicsItem,
@@ -18,23 +24,40 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtMultimediaWidgets import QGraphicsVideoItem
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtGui import QPixmap, QResizeEvent, QWheelEvent, QMouseEvent, QKeyEvent, QCursor, QColor
-from PySide6.QtCore import Qt, QPoint, QPointF, QRect, QRectF, Signal, QLineF, QTimer, QObject
+from PySide6.QtGui import QImage, QImageReader, QPixmap, QPixmapCache, QResizeEvent, QWheelEvent, QMouseEvent, QKeyEvent, QCursor, QColor, QTransform
+from PySide6.QtCore import Qt, QBuffer, QPoint, QPointF, QRect, QRectF, Signal, QLineF, QTimer, QElapsedTimer, QObject
 
 from ImageViewer.ImageInfoDialog import ImageInfoDialog
 from ImageViewer.Constants import (
     ZOOM_SCALE_FACTOR,
-    DODGER_BLUE_50PC,
-    IMAGE_EXTENSIONS,
+    ExtensionKind,
     VIDEO_SKIP_AMOUNT,
     AUDIO_ADJUST_AMOUNT,
     VIDEO_UI_MARGIN,
     VIDEO_POSITION_LINE_SIZE,
     VIDEO_UI_TIMEOUT,
+    VIDEO_UI_UPDATE_INTERVAL,
+    SLIDER_PREVIEW_INTERVAL,
+    PIXMAP_CACHE_LIMIT,
+    PRELOAD_SIZE_LIMIT,
+    BACKGROUND_DECODE_PIXELS,
+    UNDO_BUFFER_SIZE,
+    UNDO_COALESCE_INTERVAL,
+    PIXMAP_UPDATE_DELAY,
+    ADJUST_COMMIT_DELAY,
+    SELECTION_UPDATE_INTERVAL,
 )
+from ImageViewer.Colours import DODGER_BLUE_50PC, WHITE_PEN
 import ImageViewer.ImageTools as ImageTools
 from ImageViewer.SliderDialog import SliderDialog
 
+# The Qt image formats which match the layout of Pillow's raw data for each mode
+PIL_QT_FORMATS = {
+    'RGB': QImage.Format.Format_RGB888,
+    'RGBA': QImage.Format.Format_RGBA8888,
+    'L': QImage.Format.Format_Grayscale8,
+}
+
 class PolygonSignaller(QObject):
     durationJumpSignal = Signal(float)
 
@@ -63,12 +86,35 @@ class DurationPolygonItem(QGraphicsPolygonItem):
             # Send the duration jump signal
             self.signaller.durationJumpSignal.emit(percentage)
 
+# A change to an image, taking the current image and returning the changed version
+ImageJob = Callable[[Image.Image], Image.Image]
+
+def _AfterAdjustments(job: ImageJob, adjustments: tuple[tuple[str, Optional[float]], ...], image: Image.Image) -> Image.Image:
+    # Make a change after applying the steps and filters that were queued before it
+    return job(ImageTools.ApplyAdjustments(image, adjustments))
+
 class FullImage(QGraphicsView):
+    # Thread for making changes to images, a single worker so changes are applied in order
+    _editExecutor = ThreadPoolExecutor(max_workers=1)
+
+    # Source of unique keys for the pixmaps of images in the undo buffer
+    _undoKeys = count()
+
+    # Signal emitted from the edit thread with the generation, changed image and compressed previous image
+    _editFinishedSignal = Signal(int, object, object)
+
+    # Signal emitted from the edit thread with the generation and the full image decoded by Qt (None if Qt could not decode it)
+    _fullImageLoadedSignal = Signal(int, object)
+
+    # Signal emitted from the edit thread when an undone version has been compressed
+    _redoCompressedSignal = Signal()
+
     # Signals to enable and disable menu items
     resetZoomEnableSignal = Signal(bool)
     canZoomToRectSignal = Signal(bool)
     canCropToRectSignal = Signal(bool)
     imageModifiedSignal = Signal(bool)
+    canRedoSignal = Signal(bool)
     imageLoadedSignal = Signal(bool)
     videoLoadedSignal = Signal(bool)
 
@@ -81,18 +127,57 @@ class FullImage(QGraphicsView):
         # Use the built in drag scrolling
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
 
+        # Only repaint the areas of the viewport that have changed, e.g. the old and new position of the video position line
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+
         # Create a pixmap to hold the image
         self._pixmap = QPixmap()
 
+        # Indicate whether the pixmap shows the PIL image rather than a preview
+        self._pixmapShowsPilImage = False
+
+        # Allow enough room in the pixmap cache for the pixmaps of several undo buffer entries (in KB)
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT)
+
         # A Qt Image from pillow to contain the original image
         self._pilImage: Optional[Image.Image] = None
 
-        # A temporary image for use when adjusting colour, contrast and brightness
-        self._adjustedImage: Optional[Image.Image] = None
+        # Incremented whenever a new image is loaded so the results of changes to the old one are discarded
+        self._editGeneration = 0
+
+        # Indicate whether a change is being made to the image in the edit thread
+        self._editInProgress = False
+
+        # A ring buffer of the versions of the image that have been undone, the most recent last, along with the key
+        # of the version's pixmap in the pixmap cache, each is compressed in the edit thread
+        self._redoBuffer: deque[tuple[str, Future[ImageTools.CompressedImage]]] = deque(maxlen=UNDO_BUFFER_SIZE)
+
+        # The current image compressed, if it came from the undo or redo buffer, so it can be moved between them without compressing it again
+        self._currentCompressed: Optional[ImageTools.CompressedImage] = None
+
+        # Connect the signal from the edit thread, this is queued onto the GUI thread
+        self._editFinishedSignal.connect(self._EditFinished)
+        self._fullImageLoadedSignal.connect(self._FullImageLoaded)
+        self._redoCompressedSignal.connect(self._UpdateCanRedo)
+
+        # A view sized copy of the image to preview colour, contrast and brightness changes on
+        self._previewSource: Optional[Image.Image] = None
+
+        # The colour enhancer for the preview image, created once as it holds a greyscale copy of the image
+        self._previewColourEnhancer: Optional[ImageEnhance.Color] = None
+
+        # The colour, contrast and brightness of the last preview
+        self._previewSliderValues: Optional[tuple[float, float, float]] = None
+
+        # The raw pixel data backing the last QImage created from a Pillow image
+        self._qtImageData = b''
 
         # Create a graphics scene for this graphics view
         self._scene = QGraphicsScene()
 
+        # The scene only ever holds a handful of items, so skip maintaining a BSP tree index of them as they are added and moved
+        self._scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
         # A pixmap graphics item for the image
         self._pixmapGraphicsItem: Optional[QGraphicsPixmapItem] = None
 
@@ -117,6 +202,24 @@ class FullImage(QGraphicsView):
         # The current time through the video
         self._currentPosition = 0
 
+        # Indicate that the view has been resized, scrolled or zoomed so the video UI geometry needs recalculating
+        self._videoUiDirty = True
+
+        # The geometry of the duration rect in view coordinates, recalculated only when the view changes
+        self._durationXStart = VIDEO_UI_MARGIN
+        self._durationYStart = 0
+        self._durationWidth = 0
+
+        # The scene coordinates of the position line, the x position at the start of the duration rect and the
+        # scene distance per view pixel, so the line can be placed without mapping it to the scene on every tick
+        self._scenePositionXStart = 0.0
+        self._scenePositionXScale = 1.0
+        self._scenePositionYStart = 0.0
+        self._scenePositionYEnd = 0.0
+
+        # The position line x position the video UI was last drawn for
+        self._videoUiPositionXPos: Optional[int] = None
+
         # Timer to hide the video UI
         self._videoUiTimer: Optional[QTimer] = None
 
@@ -129,12 +232,89 @@ class FullImage(QGraphicsView):
         # A graphics rect item for the selection rectangle
         self._graphicsRectItem: Optional[QGraphicsRectItem] = None
 
+        # The latest cursor position in view coordinates waiting to update the selection rectangle
+        self._pendingCursorPos: Optional[QPoint] = None
+
+        # Timer to limit how often the selection rectangle is updated as the mouse moves
+        self._selectionUpdateTimer = QTimer(self)
+        self._selectionUpdateTimer.setSingleShot(True)
+        self._selectionUpdateTimer.setInterval(SELECTION_UPDATE_INTERVAL)
+        self._selectionUpdateTimer.timeout.connect(self._UpdateSelectionRect) # type: ignore
+
         # Add the scene to the view
         self.setScene(self._scene)
 
         # Initialise zoomed to false
         self._zoomed = False
 
+        # The number of zoom steps from wheel events waiting to be applied, positive to zoom in and negative to zoom out
+        self._pendingZoomSteps = 0
+
+        # Timer to apply all the wheel events that arrive together as a single scale once they have been handled
+        self._zoomTimer = QTimer(self)
+        self._zoomTimer.setSingleShot(True)
+        self._zoomTimer.setInterval(0)
+        self._zoomTimer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._zoomTimer.timeout.connect(self._ApplyPendingZoom) # type: ignore
+
+        # The latest colour, contrast and brightness values from the slider dialog waiting to be previewed
+        self._pendingSliderValues: Optional[tuple[float, float, float]] = None
+
+        # Timer to coalesce slider changes so only the latest values are previewed
+        self._sliderPreviewTimer = QTimer(self)
+        self._sliderPreviewTimer.setSingleShot(True)
+        self._sliderPreviewTimer.setInterval(SLIDER_PREVIEW_INTERVAL)
+        self._sliderPreviewTimer.timeout.connect(self._applySliderPreview) # type: ignore
+
+        # Time since the video UI was last redrawn, used to limit how often it is redrawn as the video plays
+        self._videoUiUpdateElapsed = QElapsedTimer()
+
+        # Timer to redraw the video UI with the latest position once the limit has passed
+        self._videoUiUpdateTimer = QTimer(self)
+        self._videoUiUpdateTimer.setSingleShot(True)
+        self._videoUiUpdateTimer.setInterval(VIDEO_UI_UPDATE_INTERVAL)
+        self._videoUiUpdateTimer.timeout.connect(self.VideoPositionChanged) # type: ignore
+
+        # The last change made to the image, if it can be merged with an identical change that quickly follows it
+        self._lastEditOperation: Optional[tuple[Any, ...]] = None
+
+        # The change being made in the edit thread, if it can be merged with an identical change that quickly follows it
+        self._pendingEditOperation: Optional[tuple[Any, ...]] = None
+
+        # Time since the last change was made, used to decide whether to merge the next change with it
+        self._lastEditElapsed = QElapsedTimer()
+
+        # Timer to convert the image to a pixmap once a run of merged changes pauses
+        self._pixmapUpdateTimer = QTimer(self)
+        self._pixmapUpdateTimer.setSingleShot(True)
+        self._pixmapUpdateTimer.setInterval(PIXMAP_UPDATE_DELAY)
+        self._pixmapUpdateTimer.timeout.connect(self.UpdatePixmap) # type: ignore
+
+        # Colour, contrast and brightness steps and filters waiting to be applied to the full image in the order they were
+        # chosen, a filter is queued without a factor, the steps are shown on a preview until then
+        self._queuedAdjustments: list[tuple[str, Optional[float]]] = []
+
+        # A view sized copy of the image to preview the queued steps on
+        self._adjustPreviewSource: Optional[Image.Image] = None
+
+        # Timer to apply the queued steps to the full image once they pause
+        self._adjustCommitTimer = QTimer(self)
+        self._adjustCommitTimer.setSingleShot(True)
+        self._adjustCommitTimer.setInterval(ADJUST_COMMIT_DELAY)
+        self._adjustCommitTimer.timeout.connect(self._CommitAdjustments) # type: ignore
+
+        # Indicate that the adjust dialog should be opened once the change in progress finishes
+        self._adjustDialogPending = False
+
+        # Indicate that the image should be saved once the change in progress finishes
+        self._savePending = False
+
+        # Timer to apply the queued steps as soon as the current events have been handled, used once a filter is queued
+        self._filterTimer = QTimer(self)
+        self._filterTimer.setSingleShot(True)
+        self._filterTimer.setInterval(0)
+        self._filterTimer.timeout.connect(self._CommitAdjustments) # type: ignore
+
     def InitialiseView(self, imagePath:Path) -> None:
         # Set the image path
         self._imagePath = imagePath
@@ -145,20 +325,48 @@ class FullImage(QGraphicsView):
         # Indicate whether we have zoomed in at all
         self.ResetZoom()
 
+        # Discard any change still being made to the previous image
+        self._editGeneration += 1
+        self._editInProgress = False
+
+        # Do not merge changes to the new image with those to the previous one
+        self._lastEditOperation = None
+        self._pixmapUpdateTimer.stop()
+
+        # Drop any steps and filters queued for the previous image, and do not open the adjust dialog for it or save it
+        self._DropQueuedAdjustments()
+        self._adjustDialogPending = False
+        self._savePending = False
+
         # Store how much the current image is scaled
         self._currentScale: float = 1.0
 
         # Indicate that Control is held down
         self._ctrlHeld = False
 
-        # A point for the start of the drag
-        self._startDragPoint: Optional[QPoint] = None
+        # A point for the start of the drag in scene coordinates
+        self._sceneStartDragPoint: Optional[QPointF] = None
+
+        # Remove the pixmaps of the previous image's undo buffer from the cache
+        for key, _ in getattr(self, '_undoBuffer', ()):
+            QPixmapCache.remove(key)
 
-        # A list containing the last n versions of this image
-        self._undoBuffer: list[Image.Image] = []
+        # A ring buffer containing the last n versions of this image, compressed to save memory, along with
+        # the key of the version's pixmap in the pixmap cache
+        self._undoBuffer: deque[tuple[str, ImageTools.CompressedImage]] = deque(maxlen=UNDO_BUFFER_SIZE)
 
-        # If there is an old pixmap, remove it and set it to None
-        if self._pixmapGraphicsItem is not None:
+        # Whether the oldest versions have been dropped from the full undo buffer
+        self._undoBufferTruncated = False
+
+        # Forget the undone versions of the previous image
+        self._ClearRedoBuffer()
+        self._currentCompressed = None
+
+        # Check whether this is an image or a video
+        isImage = ExtensionKind(self._imagePath.suffix) == 'image'
+
+        # If there is an old pixmap and this is a video, remove it and set it to None (images reuse the item)
+        if self._pixmapGraphicsItem is not None and not isImage:
             self._scene.removeItem(self._pixmapGraphicsItem)
             self._pixmapGraphicsItem = None
 
@@ -183,11 +391,21 @@ class FullImage(QGraphicsView):
         # Reset the current position
         self._currentPosition = 0
 
+        # Force the video UI to be drawn in full next time
+        self._videoUiDirty = True
+        self._videoUiPositionXPos = None
+
+        # Drop any pending redraw of the video UI
+        self._videoUiUpdateTimer.stop()
+
         # Clear the Video UI Timer
         if self._videoUiTimer is not None:
             self._videoUiTimer.stop()
             self._videoUiTimer = None
 
+        # Drop any pending update of the selection rect
+        self._selectionUpdateTimer.stop()
+
         # If a graphics rect exists, remove it and set to None
         if self._graphicsRectItem is not None:
             self._scene.removeItem(self._graphicsRectItem)
@@ -200,7 +418,7 @@ class FullImage(QGraphicsView):
         # Boolean indicating whether a change to the image can be saved
         self._imageCanBeSaved = False
 
-        if self._imagePath.suffix in IMAGE_EXTENSIONS.values():
+        if isImage:
             # Load the image, convert it to a pixmap and add it to the scene
             self._LoadPixmap()
         else:
@@ -208,23 +426,77 @@ class FullImage(QGraphicsView):
             self._LoadVideo()
 
     def _LoadPixmap(self) -> None:
-        # Use Pillow to open the image and convert to a QPixmap
-        self._pilImage = Image.open(self._imagePath)
+        # Use Pillow to open the image, this only reads the header, reading smaller files in a single call
+        # rather than letting Pillow make many small reads from the file
+        imageSource: bytes | Path
+
+        if self._imagePath.stat().st_size <= PRELOAD_SIZE_LIMIT:
+            imageSource = self._imagePath.read_bytes()
+            self._pilImage = Image.open(BytesIO(imageSource))
+            proxyImage = Image.open(BytesIO(imageSource))
+        else:
+            imageSource = self._imagePath
+            self._pilImage = Image.open(imageSource)
+            proxyImage = Image.open(imageSource)
+
+        # Ask the JPEG decoder for a reduced size version close to the size of the view, other formats ignore this,
+        # skipping it if the view has no size yet
+        viewSize = (self.viewport().width(), self.viewport().height())
+
+        if viewSize[0] > 0 and viewSize[1] > 0:
+            proxyImage.draft(proxyImage.mode, viewSize)
+
+        # Only use the reduced size version if the decoder could actually shrink the image
+        if proxyImage.size != self._pilImage.size:
+            # Show the reduced size version for now
+            qtImage = self._PilToQImage(proxyImage)
+
+            # Prevent changes until the full image has loaded
+            self._editInProgress = True
+
+            # Load the full image in the edit thread
+            self._editExecutor.submit(self._LoadFullImageInThread, self._editGeneration, imageSource)
+        elif self._pilImage.width * self._pilImage.height > BACKGROUND_DECODE_PIXELS:
+            # Large images with no reduced size version are shown as a transparent placeholder, scaled to the
+            # size of the image, so the scene and zoom can be set up while the image is decoded
+            qtImage = QImage(1, 1, QImage.Format.Format_ARGB32)
+            qtImage.fill(Qt.GlobalColor.transparent)
+
+            # Prevent changes until the full image has loaded
+            self._editInProgress = True
+
+            # Load the full image in the edit thread
+            self._editExecutor.submit(self._LoadFullImageInThread, self._editGeneration, imageSource)
+        else:
+            # Decode the image for display with Qt, Pillow only decodes the image when it is first changed
+            qtImage = self._ReadQImage(imageSource)
 
-        # Convert to a QImage
-        qtImage = ImageQt(self._pilImage)
+            # Fall back to Pillow if Qt cannot decode the image
+            if qtImage.isNull():
+                qtImage = self._PilToQImage(self._pilImage)
 
         # Convert the QImage to a Pixmap
-        self._pixmap.convertFromImage(qtImage)
+        self._pixmap = QPixmap.fromImage(qtImage)
+        self._pixmapShowsPilImage = qtImage.size().toTuple() == self._pilImage.size
 
-        # Get the QGraphicsPixmapItem
-        self._pixmapGraphicsItem = QGraphicsPixmapItem(self._pixmap)
+        if self._pixmapGraphicsItem is None:
+            # Get the QGraphicsPixmapItem
+            self._pixmapGraphicsItem = QGraphicsPixmapItem(self._pixmap)
+
+            # Cache the item as drawn on screen so panning does not resample the pixmap
+            self._pixmapGraphicsItem.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
-        # Add the pixmap graphics item to the scene
-        self._scene.addItem(self._pixmapGraphicsItem)
+            # Add the pixmap graphics item to the scene
+            self._scene.addItem(self._pixmapGraphicsItem)
+        else:
+            # Reuse the existing pixmap graphics item, swapping in the new pixmap
+            self._pixmapGraphicsItem.setPixmap(self._pixmap)
+
+        # Scale a reduced size version up so that scene coordinates match the pixels of the full image
+        self._pixmapGraphicsItem.setTransform(QTransform.fromScale(self._pilImage.width / self._pixmap.width(), self._pilImage.height / self._pixmap.height()))
 
         # Set the scene rect to the bounding rect of the pixmap
-        self._scene.setSceneRect(self._pixmapGraphicsItem.boundingRect())
+        self._scene.setSceneRect(self._pixmapGraphicsItem.sceneBoundingRect())
 
         # Reset the zoom
         self.ResetZoom()
@@ -235,6 +507,77 @@ class FullImage(QGraphicsView):
         # Signal that a video is not loaded
         self.videoLoadedSignal.emit(False)
 
+    @staticmethod
+    def _ReadQImage(imageSource: bytes | Path) -> QImage:
+        # Create a reader for the file contents or the file itself
+        if isinstance(imageSource, bytes):
+            buffer = QBuffer()
+            buffer.setData(imageSource)
+            reader = QImageReader(buffer)
+        else:
+            reader = QImageReader(imageSource.as_posix())
+
+        # Leave the orientation as stored in the file so the image matches the one decoded by Pillow
+        reader.setAutoTransform(False)
+
+        # Decode the image, returning a null image if this fails
+        return reader.read()
+
+    def _LoadFullImageInThread(self, generation: int, imageSource: bytes | Path) -> None:
+        # Skip the decode if a different image has been loaded since, so paging quickly through images does not leave
+        # the current one waiting behind decodes of images that are no longer shown
+        if generation != self._editGeneration:
+            return
+
+        # Decode the full image with Qt
+        qtImage = self._ReadQImage(imageSource)
+
+        # Let the GUI thread know the load is complete
+        self._fullImageLoadedSignal.emit(generation, None if qtImage.isNull() else qtImage)
+
+    def _FullImageLoaded(self, generation: int, qtImage: Optional[QImage]) -> None:
+        # Ignore the result if a different image has been loaded since
+        if generation != self._editGeneration:
+            return
+
+        # Changes can now be made to the image
+        self._editInProgress = False
+
+        if self._pilImage is not None and self._pixmapGraphicsItem is not None:
+            try:
+                # Fall back to Pillow if Qt could not decode the image
+                if qtImage is None:
+                    qtImage = self._PilToQImage(self._pilImage)
+            except Exception as error:
+                # Log the error, the reduced size version stays on display
+                logging.log(logging.ERROR, f'Failed to load {self._imagePath}: {error}')
+                return
+
+            # Swap the full image in for the reduced size version, the scene rect and zoom are unchanged
+            self._pixmap = QPixmap.fromImage(qtImage)
+            self._pixmapShowsPilImage = True
+            self._pixmapGraphicsItem.setPixmap(self._pixmap)
+            self._pixmapGraphicsItem.setTransform(QTransform())
+
+        # Apply any steps and filters chosen while the image was loading
+        if self._queuedAdjustments:
+            self._ScheduleAdjustments()
+
+        # Open the adjust dialog if it was chosen while the image was loading
+        if self._adjustDialogPending:
+            QTimer.singleShot(0, self._openAdjustDialog)
+
+    def _PilToQImage(self, pilImage: Image.Image) -> QImage:
+        # Convert any mode Qt cannot use directly to greyscale, RGB or RGBA
+        pilImage = ImageTools.NativeMode(pilImage)
+
+        # Get the raw pixel data, keeping a reference as the QImage uses this buffer rather than copying it
+        self._qtImageData = pilImage.tobytes()
+
+        # Wrap the pixel data in a QImage, each line is the width multiplied by the number of bytes per pixel
+        bytesPerLine = pilImage.width * len(pilImage.getbands())
+        return QImage(self._qtImageData, pilImage.width, pilImage.height, bytesPerLine, PIL_QT_FORMATS[pilImage.mode])
+
     def _LoadVideo(self) -> None:
         # Create the graphics video item
         self._graphicsVideoItem = QGraphicsVideoItem()
@@ -285,6 +628,7 @@ class FullImage(QGraphicsView):
         if self._graphicsRectItem:
             # Zoom to this rectangle, maintaining aspect ratio
             self.fitInView(self._graphicsRectItem, Qt.AspectRatioMode.KeepAspectRatio)
+            self._videoUiDirty = True
 
             # Remove the rectangle
             self._scene.removeItem(self._graphicsRectItem)
@@ -314,10 +658,31 @@ class FullImage(QGraphicsView):
         # We are no longer zoomed
         self._zoomed = False
 
+        # The video UI will need recalculating for the new scale
+        self._videoUiDirty = True
+
         # Signal the menu item to be disabled
         self.resetZoomEnableSignal.emit(False)
 
     def UpdatePixmap(self, adjstedImage: Optional[Image.Image] = None) -> None:
+        if self._pilImage is not None:
+            # Convert the pillow image into a QImage
+            if adjstedImage is None:
+                qtImage = self._PilToQImage(self._pilImage)
+            else:
+                qtImage = self._PilToQImage(adjstedImage)
+
+            # Set the pixmap to this new image
+            self._pixmap = QPixmap.fromImage(qtImage)
+            self._pixmapShowsPilImage = adjstedImage is None
+
+            # Any pending update is no longer needed
+            self._pixmapUpdateTimer.stop()
+
+            # Show the new pixmap
+            self._ShowPixmap()
+
+    def _ShowPixmap(self) -> None:
         if self._pilImage is not None:
             if self._graphicsRectItem is not None:
                 # Remove the rect if it exists
@@ -329,210 +694,433 @@ class FullImage(QGraphicsView):
                 # Signal the menu item to be disabled
                 self.canZoomToRectSignal.emit(False)
                 self.canCropToRectSignal.emit(False)
-    
-            # Convert the pillow image into a QImage
-            if adjstedImage is None:
-                qtImage = self._pilImage.toqimage()
-            else:
-                qtImage = adjstedImage.toqimage()
 
-            # Set the pixmap to this new image
-            self._pixmap.convertFromImage(qtImage)
+            # Store the scene rect of the old pixmap
+            oldSceneRect = self._scene.sceneRect()
 
-            if self._pixmapGraphicsItem is not None:
-                # Remove the old pixmap from the scene
-                self._scene.removeItem(self._pixmapGraphicsItem)
+            if self._pixmapGraphicsItem is None:
+                # Add the new pixmap to the scene
+                self._pixmapGraphicsItem = QGraphicsPixmapItem(self._pixmap)
+                self._pixmapGraphicsItem.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+                self._scene.addItem(self._pixmapGraphicsItem)
+            else:
+                # Update the existing item in place rather than rebuilding it
+                self._pixmapGraphicsItem.setPixmap(self._pixmap)
 
-            # Add the new pixmap to the scene
-            self._pixmapGraphicsItem = QGraphicsPixmapItem(self._pixmap)
-            self._scene.addItem(self._pixmapGraphicsItem)
+            # Scale a reduced size preview up so it covers the same area of the scene as the full image
+            self._pixmapGraphicsItem.setTransform(QTransform.fromScale(self._pilImage.width / self._pixmap.width(), self._pilImage.height / self._pixmap.height()))
 
-            # Fit the new pixmap in the view
-            self.fitInView(self._pixmapGraphicsItem, Qt.AspectRatioMode.KeepAspectRatio)
+            # The scene and view only need updating if the size of the image has changed (e.g. after a crop)
+            if self._pixmapGraphicsItem.sceneBoundingRect() != oldSceneRect:
+                # Set the scene rect to the new pixmap
+                self._scene.setSceneRect(self._pixmapGraphicsItem.sceneBoundingRect())
 
-            # Set the scene rect to the new pixmap
-            self._scene.setSceneRect(self._pixmapGraphicsItem.boundingRect())
+                # Fit the new pixmap in the view
+                self.fitInView(self._pixmapGraphicsItem, Qt.AspectRatioMode.KeepAspectRatio)
 
-            # Indicate that we are not zoomed
-            self._zoomed = False
+                # Indicate that we are not zoomed
+                self._zoomed = False
 
-            # Signal the menu item to be disabled
-            self.resetZoomEnableSignal.emit(False)
+                # Signal the menu item to be disabled
+                self.resetZoomEnableSignal.emit(False)
 
     def UndoLastChange(self) -> None:
-        # If there are items in the buffer
-        if self._undoBuffer:
-            # Pop the latest image off the buffer
-            self._pilImage = self._undoBuffer.pop()
+        # Undo any steps and filters that have not yet been applied to the full image by dropping them
+        if self._queuedAdjustments:
+            self._DropQueuedAdjustments()
 
-            # Update the pixmap to this older image
-            self.UpdatePixmap()
+            # Replace any preview of the steps with the image
+            if not self._editInProgress and not self._pixmapShowsPilImage:
+                self.UpdatePixmap()
+
+            return
+
+        # If there are items in the buffer and no change is being made
+        if self._undoBuffer and not self._editInProgress:
+            # Do not merge the next change with the one being undone
+            self._lastEditOperation = None
+            self._pixmapUpdateTimer.stop()
+
+            # Remove the pixmap of the oldest undone version from the cache if it is about to be dropped from the buffer
+            if len(self._redoBuffer) == self._redoBuffer.maxlen:
+                QPixmapCache.remove(self._redoBuffer[0][0])
+
+            # Keep the current image so the change can be redone, compressing it in the edit thread unless it is already compressed
+            if self._currentCompressed is not None:
+                compressedFuture: Future[ImageTools.CompressedImage] = Future()
+                compressedFuture.set_result(self._currentCompressed)
+            else:
+                compressedFuture = self._editExecutor.submit(ImageTools.CompressImage, self._pilImage)
+
+                # Let the GUI thread know when it has been compressed so the change can be redone
+                compressedFuture.add_done_callback(lambda _: self._redoCompressedSignal.emit())
 
-        if not self._undoBuffer:
+            self._redoBuffer.append((self._CacheCurrentPixmap(), compressedFuture))
+
+            # Signal the menu item to be enabled if the current image is ready to be redone
+            self._UpdateCanRedo()
+
+            # Pop the latest image off the buffer and show it
+            key, compressedImage = self._undoBuffer.pop()
+            self._ShowVersion(key, compressedImage)
+
+        if not self._undoBuffer and not self._undoBufferTruncated:
             # If the undo buffer has been exhausted we are back to the original image so disable saving
             self._imageCanBeSaved = False
 
             # Signal the menu item to be disabled
             self.imageModifiedSignal.emit(False)
 
+    def RedoLastChange(self) -> None:
+        # If there are undone versions, the latest has been compressed and no change is being made
+        if self._redoBuffer and self._redoBuffer[-1][1].done() and self._currentCompressed is not None and not self._editInProgress:
+            # Do not merge the next change with the one being redone
+            self._lastEditOperation = None
+            self._pixmapUpdateTimer.stop()
+
+            # Note whether the oldest image is about to be dropped from the undo buffer, removing its pixmap from the cache
+            if len(self._undoBuffer) == self._undoBuffer.maxlen:
+                self._undoBufferTruncated = True
+                QPixmapCache.remove(self._undoBuffer[0][0])
+
+            # Put the current image back in the undo buffer, it came from one of the buffers so is already compressed
+            self._undoBuffer.append((self._CacheCurrentPixmap(), self._currentCompressed))
+
+            # Pop the latest undone image off the buffer and show it
+            key, compressedFuture = self._redoBuffer.pop()
+            self._ShowVersion(key, compressedFuture.result())
+
+            # Indicate that the image can be saved
+            self._imageCanBeSaved = True
+
+            # Signal the menu items to be updated
+            self.imageModifiedSignal.emit(True)
+            self._UpdateCanRedo()
+
+    def _UpdateCanRedo(self) -> None:
+        # Only allow redoing once the latest undone version has been compressed, so redoing never waits on the edit thread
+        self.canRedoSignal.emit(bool(self._redoBuffer) and self._redoBuffer[-1][1].done())
+
+    def _CacheCurrentPixmap(self) -> str:
+        # Get a key for the current image
+        key = f'undo-{next(self._undoKeys)}'
+
+        # Cache the pixmap of the current image if it is on display so returning to this image does not need to convert it again
+        if self._pixmapShowsPilImage:
+            QPixmapCache.insert(key, self._pixmap)
+
+        return key
+
+    def _ShowVersion(self, key: str, compressedImage: ImageTools.CompressedImage) -> None:
+        # Make the version from the undo or redo buffer the current image, keeping it compressed for moving it back
+        self._pilImage = ImageTools.DecompressImage(compressedImage)
+        self._currentCompressed = compressedImage
+
+        # Use the cached pixmap of this image if it is still available, otherwise convert the image again
+        pixmap = QPixmap()
+
+        if QPixmapCache.find(key, pixmap):
+            # Show the cached pixmap and remove it from the cache
+            self._pixmap = pixmap
+            self._pixmapShowsPilImage = True
+            self._ShowPixmap()
+            QPixmapCache.remove(key)
+        else:
+            # Update the pixmap to this image
+            self.UpdatePixmap()
+
+    def _ClearRedoBuffer(self) -> None:
+        if self._redoBuffer:
+            # Remove the pixmaps of the undone versions from the cache and forget them
+            for key, _ in self._redoBuffer:
+                QPixmapCache.remove(key)
+
+            self._redoBuffer.clear()
+
+            # Signal the menu item to be disabled
+            self.canRedoSignal.emit(False)
+
     def SaveImage(self) -> None:
+        # Apply any queued steps and filters now so that they are included in the saved image
+        self._CommitAdjustments()
+
+        # Wait for any change in progress to finish before saving the image, the image is saved once it has
+        if self._editInProgress:
+            self._savePending = True
+            return
+
+        self._savePending = False
+
         if self._imageCanBeSaved and self._pilImage is not None:
             # Construct the filename
             filename = self._imagePath.parent / f'{self._imagePath.stem} - Modified {datetime.now().strftime("%y-%m-%d %H.%M.%S")}.png'
 
-            # Save the image
-            self._pilImage.save(filename)
+            # Save the image in the edit thread so the GUI stays responsive while it is encoded, changes replace
+            # the image rather than altering it so the image being saved is left as it is
+            self._editExecutor.submit(self._SaveInThread, self._pilImage, filename)
 
     @staticmethod
-    def undo(func: Callable) -> Callable:
-        def wrapper(self: FullImage, *args:tuple[Any], **kwargs: dict[str, Any]):
-            if self._pilImage is not None:
-                # Add the current image to the undo buffer
-                self._undoBuffer.append(self._pilImage)
+    def _SaveInThread(image: Image.Image, filename: Path) -> None:
+        try:
+            # Encode and write the image
+            image.save(filename)
+        except Exception as error:
+            # Log the error
+            logging.log(logging.ERROR, f'Failed to save {filename}: {error}')
 
-                # Call the manipulation function
-                func(self, args, kwargs)
-
-                # Update the pixmap
-                self.UpdatePixmap()
-
-                # Indicate that the image can be saved
-                self._imageCanBeSaved = True
-
-                # Signal the menu item to be enabled
-                self.imageModifiedSignal.emit(True)
+    @staticmethod
+    def undo(func: Optional[Callable] = None, *, coalesce: bool = False) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(self: FullImage, *args: Any, **kwargs: Any) -> None:
+                if self._pilImage is not None and not self._editInProgress:
+                    # Get the change to make from the manipulation function
+                    job: Optional[ImageJob] = func(self, *args, **kwargs)
+
+                    if job is not None:
+                        # Apply any queued steps and filters first so that the changes are made in the order they were chosen
+                        adjustments = self._TakeQueuedAdjustments()
+
+                        if adjustments:
+                            job = partial(_AfterAdjustments, job, adjustments)
+
+                        # Identify this change so that an identical one following it can be merged with it, a change made
+                        # along with queued steps is never merged
+                        self._pendingEditOperation = (func, args, tuple(sorted(kwargs.items()))) if coalesce and not adjustments else None
+
+                        # Merge this change with the last one if it is the same change made shortly afterwards
+                        merge = (
+                            self._pendingEditOperation is not None
+                            and self._pendingEditOperation == self._lastEditOperation
+                            and not self._lastEditElapsed.hasExpired(UNDO_COALESCE_INTERVAL)
+                        )
+
+                        # A new change means the undone versions can no longer be redone
+                        self._ClearRedoBuffer()
+
+                        # Indicate that a change is in progress and show the busy cursor
+                        self._editInProgress = True
+                        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+
+                        # Make the change in the edit thread so the GUI stays responsive
+                        self._editExecutor.submit(self._EditInThread, self._editGeneration, self._pilImage, job, not merge)
+
+            return wrapper
+
+        # Allow the decorator to be used as @undo or @undo(coalesce=True), coalesced changes repeated in quick
+        # succession with the same arguments are merged into a single entry in the undo buffer
+        return decorator if func is None else decorator(func)
+
+    def _EditInThread(self, generation: int, image: Image.Image, job: ImageJob, addToUndoBuffer: bool) -> None:
+        # Skip the change if a different image has been loaded since, the GUI thread still needs to know to restore the cursor
+        if generation != self._editGeneration:
+            self._editFinishedSignal.emit(generation, None, None)
+            return
+
+        try:
+            # Compress the current image for the undo buffer, unless this change is merged with the last one
+            compressedImage = ImageTools.CompressImage(image) if addToUndoBuffer else None
+
+            # Make the change, converting the image to a mode that can be filtered and shown without further conversion
+            # if needed, this only happens on the first change as the changed image keeps the new mode
+            changedImage = job(ImageTools.NativeMode(image))
+        except Exception as error:
+            # Log the error, the image is left unchanged
+            logging.log(logging.ERROR, f'Failed to change image: {error}')
+            compressedImage = changedImage = None
+
+        # Send the result back to the GUI thread
+        self._editFinishedSignal.emit(generation, changedImage, compressedImage)
+
+    def _EditFinished(self, generation: int, changedImage: Optional[Image.Image], compressedImage: Optional[ImageTools.CompressedImage]) -> None:
+        # Restore the cursor
+        QApplication.restoreOverrideCursor()
+
+        # Ignore the result if a different image has been loaded since the change started
+        if generation != self._editGeneration:
+            return
+
+        # Indicate that the change has completed
+        self._editInProgress = False
+
+        # Any preview of queued steps was made from the image before this change
+        self._adjustPreviewSource = None
+
+        if changedImage is None:
+            # The change failed so do not merge the next one with it
+            self._lastEditOperation = None
+        elif compressedImage is None:
+            # This change was merged with the last one so leave the undo buffer alone
+            self._pilImage = changedImage
+            self._currentCompressed = None
+            self._lastEditOperation = self._pendingEditOperation
+            self._lastEditElapsed.start()
+
+            # Wait briefly before converting the image so that a quick run of merged changes is only converted once
+            self._pixmapShowsPilImage = False
+            self._pixmapUpdateTimer.start()
+        else:
+            # Note whether the oldest image is about to be dropped from the buffer, removing its pixmap from the cache
+            if len(self._undoBuffer) == self._undoBuffer.maxlen:
+                self._undoBufferTruncated = True
+                QPixmapCache.remove(self._undoBuffer[0][0])
 
-        return wrapper
+            # Add the previous image to the undo buffer, caching its pixmap so undoing this change does not need to convert it again
+            self._undoBuffer.append((self._CacheCurrentPixmap(), compressedImage))
 
-    @undo
-    def UpdateImage(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        # Set the PIL image to the adjusted image storing the last PIL image in the undo buffer
-        self._pilImage = self._adjustedImage
+            # Update the image and pixmap
+            self._pilImage = changedImage
+            self._currentCompressed = None
+            self.UpdatePixmap()
 
-    @undo
-    def CropImage(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._graphicsRectItem is not None and self._pilImage is not None:
-            # Get the rect to be cropped
-            rect = self._graphicsRectItem.rect().toRect()
+            # Allow an identical change following this one to be merged with it
+            self._lastEditOperation = self._pendingEditOperation
+            self._lastEditElapsed.start()
 
-            # Copy the cropped area out of the QImage
-            self._pilImage = self._pilImage.crop((rect.left(), rect.top(), rect.right(), rect.bottom()))
+            # Indicate that the image can be saved
+            self._imageCanBeSaved = True
 
-    @undo
-    def Sharpen(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.Sharpen(self._pilImage)
+            # Signal the menu item to be enabled
+            self.imageModifiedSignal.emit(True)
 
-    @undo
-    def Blur(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.Blur(self._pilImage)
+        # Save the image if this was chosen while the change was made
+        if self._savePending:
+            self.SaveImage()
 
-    @undo
-    def Contour(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.Contour(self._pilImage)
+        # Apply any steps and filters queued while the change was made
+        if self._queuedAdjustments:
+            self._ScheduleAdjustments()
 
-    @undo
-    def Detail(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.Detail(self._pilImage)
+        # Open the adjust dialog if it was chosen while the change was made, once this signal has been handled
+        if self._adjustDialogPending:
+            QTimer.singleShot(0, self._openAdjustDialog)
 
     @undo
-    def EdgeEnhance(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.EdgeEnhance(self._pilImage)
+    def UpdateImage(self, colour: float, contrast: float, brightness: float) -> Optional[ImageJob]:
+        # Factors of 1 leave the image unchanged so there is nothing to do
+        if colour == 1.0 and contrast == 1.0 and brightness == 1.0:
+            return None
 
-    @undo
-    def Emboss(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.Emboss(self._pilImage)
+        # Adjust the colour, contrast and brightness of the image storing the last PIL image in the undo buffer
+        return partial(ImageTools.Adjust, colour=colour, contrast=contrast, brightness=brightness)
 
     @undo
-    def FindEdges(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.FindEdges(self._pilImage)
+    def CropImage(self) -> Optional[ImageJob]:
+        if self._graphicsRectItem is not None:
+            # Get the rect to be cropped
+            rect = self._graphicsRectItem.rect().toRect()
 
-    @undo
-    def Smooth(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.Smooth(self._pilImage)
+            # Copy the cropped area out of the image
+            return lambda image: image.crop((rect.left(), rect.top(), rect.right(), rect.bottom()))
 
-    @undo
-    def UnsharpMask(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.UnsharpMask(self._pilImage)
+        return None
 
-    @undo
-    def AutoContrast(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Update the image with the new version
-            self._pilImage = ImageTools.AutoContrast(self._pilImage)
+    def ApplyFilter(self, name: str) -> None:
+        # Queue the named filter after any steps already queued, filters chosen in quick succession are applied in a
+        # single change so the image is only converted for display once
+        self._QueueAdjustment(name, None)
 
     def IncreaseColour(self) -> None:
         # Increase the colour in response to a menu selection
-        self.Colour(factor = 1.1)
+        self._QueueAdjustment('Colour', 1.1)
 
     def DecreaseColour(self) -> None:
         # Decrease the colour in response to a menu selection
-        self.Colour(factor = 0.9)
-
-    @undo
-    def Colour(self, args: tuple[Any], kwargs: dict[str, float]) -> None:
-        if self._pilImage is not None:
-            self._pilImage = ImageTools.Colour(self._pilImage, kwargs.get('factor', 1.0))
+        self._QueueAdjustment('Colour', 0.9)
 
     def IncreaseContrast(self) -> None:
         # Increase the contrast in response to a menu selection
-        self.Contrast(factor = 1.1)
+        self._QueueAdjustment('Contrast', 1.1)
 
     def DecreaseContrast(self) -> None:
         # Decrease the contrast in response to a menu selection
-        self.Contrast(factor = 0.9)
-
-    @undo
-    def Contrast(self, args: tuple[Any], kwargs: dict[str, float]) -> None:
-        if self._pilImage is not None:
-            self._pilImage = ImageTools.Contrast(self._pilImage, kwargs.get('factor', 1.0))
+        self._QueueAdjustment('Contrast', 0.9)
 
     def IncreaseBrightness(self) -> None:
         # Increase the brightness in response to a menu selection
-        self.Brightness(factor = 1.1)
+        self._QueueAdjustment('Brightness', 1.1)
 
     def DecreaseBrightness(self) -> None:
         # Decrease the brightness in response to a menu selection
-        self.Brightness(factor = 0.9)
+        self._QueueAdjustment('Brightness', 0.9)
 
-    @undo
-    def Brightness(self, args: tuple[Any], kwargs: dict[str, float]) -> None:
+    def _QueueAdjustment(self, name: str, factor: Optional[float]) -> None:
         if self._pilImage is not None:
-            self._pilImage = ImageTools.Brightness(self._pilImage, kwargs.get('factor', 1.0))
+            # A new change means the undone versions can no longer be redone
+            self._ClearRedoBuffer()
 
-    @undo
-    def BlackAndWhite(self, args: tuple[Any], kwargs: dict[str, float]) -> None:
-        if self._pilImage is not None:
-            self._pilImage = ImageTools.Colour(self._pilImage, 0.0)
+            # Combine the step with the last queued one if it is the same adjustment, otherwise add it to the queue
+            lastFactor = self._queuedAdjustments[-1][1] if self._queuedAdjustments else None
+
+            if factor is not None and lastFactor is not None and self._queuedAdjustments[-1][0] == name:
+                self._queuedAdjustments[-1] = (name, lastFactor * factor)
+            else:
+                self._queuedAdjustments.append((name, factor))
+
+            self._ScheduleAdjustments()
+
+    def _ScheduleAdjustments(self) -> None:
+        if self._queuedAdjustments[-1][1] is None:
+            # Apply the queue as soon as the current events have been handled if a filter was the last thing chosen
+            self._filterTimer.start()
+        else:
+            # Otherwise show the steps on a preview straight away, the full image is only changed once the steps pause
+            self._ShowAdjustmentPreview()
+            self._adjustCommitTimer.start()
+
+    def _ShowAdjustmentPreview(self) -> None:
+        # Only read the image while no change is being made to it in the edit thread, the preview is shown once the change finishes
+        if self._pilImage is not None and not self._editInProgress:
+            if self._adjustPreviewSource is None:
+                # Reduce the image to the size of the view once for this run of steps
+                self._adjustPreviewSource = ImageTools.NativeMode(self._pilImage.copy())
+                self._adjustPreviewSource.thumbnail((self.viewport().width(), self.viewport().height()), Image.Resampling.BILINEAR)
+
+            # Show the queued steps applied to the reduced size image
+            self.UpdatePixmap(ImageTools.ApplyAdjustments(self._adjustPreviewSource, tuple(self._queuedAdjustments)))
+
+    def _CommitAdjustments(self) -> None:
+        # Wait for any change in progress to finish, the steps are scheduled again once it has
+        if self._queuedAdjustments and not self._editInProgress:
+            # Take the steps off the queue and apply them to the full image as a single change
+            adjustments = self._TakeQueuedAdjustments()
+            self._ApplyAdjustments(adjustments)
+
+            # If there was nothing to apply replace any preview of the steps with the image
+            if not adjustments and not self._pixmapShowsPilImage:
+                self.UpdatePixmap()
+
+    def _TakeQueuedAdjustments(self) -> tuple[tuple[str, Optional[float]], ...]:
+        # Take the queued steps off the queue, forgetting their preview, steps with a factor of 1 leave the image unchanged so are dropped
+        adjustments = tuple(step for step in self._queuedAdjustments if step[1] != 1.0)
+        self._DropQueuedAdjustments()
+
+        return adjustments
+
+    def _DropQueuedAdjustments(self) -> None:
+        # Forget any queued steps and their preview
+        self._adjustCommitTimer.stop()
+        self._filterTimer.stop()
+        self._queuedAdjustments.clear()
+        self._adjustPreviewSource = None
+
+    @undo(coalesce=True)
+    def _ApplyAdjustments(self, adjustments: tuple[tuple[str, Optional[float]], ...]) -> Optional[ImageJob]:
+        # There is nothing to do if every step was dropped
+        if not adjustments:
+            return None
+
+        # Apply the queued colour, contrast and brightness steps and filters in turn
+        return partial(ImageTools.ApplyAdjustments, adjustments=adjustments)
 
     @undo
-    def Denoise(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Denoise the image
-            self._pilImage = ImageTools.Denoise(self._pilImage)
+    def BlackAndWhite(self) -> ImageJob:
+        return partial(ImageTools.Colour, factor=0.0)
 
     @undo
-    def SuperResolution(self, args: tuple[Any], kwargs: dict[str, Any]) -> None:
-        if self._pilImage is not None:
-            # Upscale the image 4x
-            self._pilImage = ImageTools.SuperResolution(self._pilImage, 4)
+    def SuperResolution(self) -> ImageJob:
+        # Upscale the image 4x
+        return partial(ImageTools.SuperResolution, factor=4)
 
     def ImageInfo(self) -> None:
         if self._pilImage is not None:
@@ -552,31 +1140,88 @@ class FullImage(QGraphicsView):
             dialog.exec()
 
     def _openAdjustDialog(self) -> None:
+        # Apply any queued steps now rather than while the dialog is open
+        self._CommitAdjustments()
+
+        # Wait for any change in progress to finish before adjusting the image, the dialog is opened once it has
+        if self._editInProgress:
+            self._adjustDialogPending = True
+            return
+
+        self._adjustDialogPending = False
+
+        # Show any merged changes still waiting to be converted before previewing on top of them
+        if self._pixmapUpdateTimer.isActive():
+            self.UpdatePixmap()
+
+        # Clear any adjustment left over from a previous dialog
+        self._previewSliderValues = None
+
+        if self._pilImage is not None:
+            # Reduce the image to the size of the view once, the previews are generated from this rather than the full image
+            self._previewSource = ImageTools.NativeMode(self._pilImage.copy())
+            self._previewSource.thumbnail((self.viewport().width(), self.viewport().height()), Image.Resampling.BILINEAR)
+            self._previewColourEnhancer = ImageTools.ColourEnhancer(self._previewSource)
+
         # Create the slider dialog sending in the slots for change, accept and cancel
         sliderDialog = SliderDialog(self.SliderChanged, self.SliderChangeAccepted, self.SliderChangeRejected)
 
         # Open the dialog
         sliderDialog.exec()
 
+        # Release the preview image
+        self._previewSource = None
+        self._previewColourEnhancer = None
+
     def SliderChanged(self, colour: float, contrast: float, brightness: float) -> None:
-        if self._pilImage is not None:
-            # Adjust the colour in response to a menu selection without adding it to the undo buffer
-            self._adjustedImage = ImageTools.Colour(self._pilImage, colour)
-            self._adjustedImage = ImageTools.Contrast(self._adjustedImage, contrast)
-            self._adjustedImage = ImageTools.Brightness(self._adjustedImage, brightness)
+        # Store the latest values and (re)start the timer, the preview is only generated once the sliders pause
+        self._pendingSliderValues = (colour, contrast, brightness)
+        self._sliderPreviewTimer.start()
+
+    def _applySliderPreview(self) -> None:
+        if self._previewSource is not None and self._pendingSliderValues is not None:
+            # Get the latest slider values
+            colour, contrast, brightness = self._pendingSliderValues
+            self._pendingSliderValues = None
+
+            # Adjust the colour of the reduced size image in response to a menu selection without adding it to the undo buffer
+            previewImage = ImageTools.Adjust(self._previewSource, colour, contrast, brightness, self._previewColourEnhancer)
+
+            # Store the values so they can be applied to the full image if accepted
+            self._previewSliderValues = (colour, contrast, brightness)
 
             # Update the pixmap
-            self.UpdatePixmap(self._adjustedImage)
+            self.UpdatePixmap(previewImage)
 
     def SliderChangeAccepted(self) -> None:
-        # If the change is accepted, update the image and undo buffer
-        self.UpdateImage()
+        # Apply any values still waiting on the timer so the final slider positions are used
+        if self._sliderPreviewTimer.isActive():
+            self._sliderPreviewTimer.stop()
+            self._applySliderPreview()
+
+        # If the change is accepted, apply it to the full image and update the image and undo buffer
+        if self._previewSliderValues == (1.0, 1.0, 1.0):
+            # The sliders were returned to their starting positions so just show the full image again
+            self.UpdatePixmap()
+        elif self._previewSliderValues is not None:
+            colour, contrast, brightness = self._previewSliderValues
+            self.UpdateImage(colour=colour, contrast=contrast, brightness=brightness)
 
     def SliderChangeRejected(self) -> None:
-        # If the chane is not accepted, set the image back to the original bypassing the undo buffer
-        self.UpdatePixmap(self._pilImage)
+        # Drop any preview still waiting on the timer
+        self._sliderPreviewTimer.stop()
+        self._pendingSliderValues = None
+        self._previewSliderValues = None
+
+        # If the chane is not accepted, set the image back to the original bypassing the undo buffer, this is
+        # not needed if no preview was shown
+        if not self._pixmapShowsPilImage:
+            self.UpdatePixmap()
 
     def resizeEvent(self, a0: QResizeEvent) -> None:
+        # Get the scene coordinate of the centre of the view before the resize, the scroll position has not changed yet
+        oldSceneCentre = self.mapToScene(QRect(QPoint(0, 0), a0.oldSize()).center())
+
         super().resizeEvent(a0)
 
         if not self._zoomed:
@@ -587,9 +1232,10 @@ class FullImage(QGraphicsView):
                 self.fitInView(self._graphicsVideoItem, Qt.AspectRatioMode.KeepAspectRatio)
         else:
             # Centre on the original scene centre
-            self.centerOn(self._oldSceneCentre)
+            self.centerOn(oldSceneCentre)
 
-        # Redraw the video UI
+        # Redraw the video UI for the new size
+        self._videoUiDirty = True
         self._drawVideoUi()
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
@@ -600,8 +1246,8 @@ class FullImage(QGraphicsView):
                 # Set control held to True
                 self._ctrlHeld = True
 
-                # Store the point of the start of the drag
-                self._startDragPoint = self.mapFromGlobal(QCursor().pos())
+                # Store the point of the start of the drag, mapped to the scene once here rather than on every mouse move
+                self._sceneStartDragPoint = self.mapToScene(self.mapFromGlobal(QCursor().pos()))
 
                 # Set the drag mode to no drag
                 self.setDragMode(QGraphicsView.DragMode.NoDrag)
@@ -611,6 +1257,11 @@ class FullImage(QGraphicsView):
 
         match event.key():
             case  Qt.Key.Key_Meta: # In Qt Mac Control = Key_Meta, Command = Key_Control
+                # Update the selection rect with the last mouse position before finishing the drag
+                if self._selectionUpdateTimer.isActive():
+                    self._selectionUpdateTimer.stop()
+                    self._UpdateSelectionRect()
+
                 # Set control held to False
                 self._ctrlHeld = False
 
@@ -625,6 +1276,9 @@ class FullImage(QGraphicsView):
 
             # If this is a left click and there is a rect, remove it
             if event.button() == Qt.MouseButton.LeftButton and self._graphicsRectItem is not None:
+                # Drop any pending update which would add the rect back
+                self._selectionUpdateTimer.stop()
+
                 # Remove the rect from the scene
                 self._scene.removeItem(self._graphicsRectItem)
 
@@ -648,16 +1302,20 @@ class FullImage(QGraphicsView):
             # Start the timer
             self._videoUiTimer.start(VIDEO_UI_TIMEOUT)
 
-        if self._startDragPoint is not None and self._ctrlHeld:
-            if self._graphicsRectItem is not None:
-                # Remove the existing graphics rect item
-                self._scene.removeItem(self._graphicsRectItem)
+        if self._sceneStartDragPoint is not None and self._ctrlHeld:
+            # Store the cursor position and update the rect at most once per interval, mice can report moves far more often than the screen refreshes
+            self._pendingCursorPos = event.position().toPoint()
+
+            if not self._selectionUpdateTimer.isActive():
+                self._selectionUpdateTimer.start()
 
-            # Get the cursor position in scene coordinates
-            sceneCursorPos = self.mapToScene(self.mapFromGlobal(QCursor().pos()))
+    def _UpdateSelectionRect(self) -> None:
+        if self._sceneStartDragPoint is not None and self._ctrlHeld and self._pendingCursorPos is not None:
+            # Get the latest cursor position in scene coordinates
+            sceneCursorPos = self.mapToScene(self._pendingCursorPos)
 
             # Get the start drag point in scene coordinates
-            sceneStartDragPoint = self.mapToScene(self._startDragPoint)
+            sceneStartDragPoint = self._sceneStartDragPoint
 
             # Get the top left point (min of both xs and ys)
             topLeft = QPointF(min(sceneStartDragPoint.x(), sceneCursorPos.x()), min(sceneStartDragPoint.y(), sceneCursorPos.y()))
@@ -668,56 +1326,77 @@ class FullImage(QGraphicsView):
             # Create a rect from these two points
             rect = QRectF(topLeft, bottomRight)
 
-            # Constrain the rect to the pixmap
+            # Constrain the rect to the pixmap (in scene coordinates as a reduced size pixmap is scaled up)
             if self._pixmapGraphicsItem is not None:
-                rect = rect.intersected(self._pixmapGraphicsItem.boundingRect())
+                rect = rect.intersected(self._pixmapGraphicsItem.sceneBoundingRect())
 
-            # Add the rect to the scene
-            self._graphicsRectItem = self._scene.addRect(rect)
+            if self._graphicsRectItem is not None:
+                # Move the existing rect rather than replacing it on every mouse move
+                self._graphicsRectItem.setRect(rect)
+            else:
+                # Add the rect to the scene
+                self._graphicsRectItem = self._scene.addRect(rect)
 
-            # Set the outline to blue
-            self._graphicsRectItem.setPen(QColor(Qt.GlobalColor.blue))
+                # Set the outline to blue
+                self._graphicsRectItem.setPen(QColor(Qt.GlobalColor.blue))
 
-            # Set the fill to dodger blue, 50% opaque
-            self._graphicsRectItem.setBrush(DODGER_BLUE_50PC)
+                # Set the fill to dodger blue, 50% opaque
+                self._graphicsRectItem.setBrush(DODGER_BLUE_50PC)
 
-            # Signal the menu item to be enabled
-            self.canZoomToRectSignal.emit(True)
+                # Signal the menu item to be enabled
+                self.canZoomToRectSignal.emit(True)
 
-            # Only enable crop for images
-            if self._pixmapGraphicsItem is not None:
-                self.canCropToRectSignal.emit(True)
-            else:
-                self.canCropToRectSignal.emit(False)
+                # Only enable crop for images
+                if self._pixmapGraphicsItem is not None:
+                    self.canCropToRectSignal.emit(True)
+                else:
+                    self.canCropToRectSignal.emit(False)
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         super().wheelEvent(event)
 
         if event.angleDelta().y() > 0:
-            # Scale the image up by the zoom factor
-            self.scale(ZOOM_SCALE_FACTOR, ZOOM_SCALE_FACTOR)
+            # Add a step to scale the image up by the zoom factor
+            self._pendingZoomSteps += 1
 
-            # Show that we have zoomed
-            self._zoomed = True
+        elif event.angleDelta().y() < 0:
+            # Add a step to scale the image down by the zoom factor
+            self._pendingZoomSteps -= 1
 
-            # Signal the menu item to be enabled
-            self.resetZoomEnableSignal.emit(True)
+        else:
+            return
 
-        elif event.angleDelta().y() < 0:
-            # Scale the image down by the zoom factor
-            self.scale(1 / ZOOM_SCALE_FACTOR, 1 / ZOOM_SCALE_FACTOR)
+        # Scale once for all the wheel events handled together, trackpads can send many of these at a time
+        if not self._zoomTimer.isActive():
+            self._zoomTimer.start()
 
-            # Show that we have zoomed
-            self._zoomed = True
+    def _ApplyPendingZoom(self) -> None:
+        # Take the steps waiting to be applied
+        steps = self._pendingZoomSteps
+        self._pendingZoomSteps = 0
 
-            # Signal the menu item to be enabled
-            self.resetZoomEnableSignal.emit(True)
+        # Nothing to do if the steps cancelled each other out
+        if steps == 0:
+            return
+
+        # Scale the image by the zoom factor once for each step
+        scale = ZOOM_SCALE_FACTOR ** steps
+        self.scale(scale, scale)
+
+        # The video UI will need recalculating for the new scale
+        self._videoUiDirty = True
+
+        # Show that we have zoomed
+        self._zoomed = True
+
+        # Signal the menu item to be enabled
+        self.resetZoomEnableSignal.emit(True)
 
     def scrollContentsBy(self, dx: int, dy: int) -> None:
         super().scrollContentsBy(dx, dy)
 
-        # Get the scene coordinate of the centre of this view
-        self._oldSceneCentre = self.mapToScene(self.rect().center())
+        # The video UI has moved in scene coordinates
+        self._videoUiDirty = True
 
     def ReturnToBrowser(self) -> None:
         # Stop the video
@@ -782,11 +1461,24 @@ class FullImage(QGraphicsView):
         self._audioOutput.setMuted(not self._audioOutput.isMuted())
 
     def VideoPositionChanged(self) -> None:
+        # If the UI was redrawn too recently, redraw it once the interval has passed instead
+        if self._videoUiUpdateElapsed.isValid() and self._videoUiUpdateElapsed.elapsed() < VIDEO_UI_UPDATE_INTERVAL:
+            if not self._videoUiUpdateTimer.isActive():
+                self._videoUiUpdateTimer.start()
+            return
+
+        # Restart the time since the last redraw
+        self._videoUiUpdateElapsed.start()
+
         if self._durationGraphicsPolygonItem is None:
             # Create the duration polygon and add it to the scene
             self._durationGraphicsPolygonItem = DurationPolygonItem()
             self._scene.addItem(self._durationGraphicsPolygonItem)
 
+            # Set the border to transparent and the fill to dodger blue, these never change so are only set here
+            self._durationGraphicsPolygonItem.setPen(Qt.PenStyle.NoPen)
+            self._durationGraphicsPolygonItem.setBrush(DODGER_BLUE_50PC)
+
             # Connect the duration jump signal
             self._durationGraphicsPolygonItem.signaller.durationJumpSignal.connect(self._positionJump)
 
@@ -795,6 +1487,9 @@ class FullImage(QGraphicsView):
             self._positionGraphicsLineItem = QGraphicsLineItem()
             self._scene.addItem(self._positionGraphicsLineItem)
 
+            # Set the line to white
+            self._positionGraphicsLineItem.setPen(WHITE_PEN)
+
         # Get the video length
         self._videoLength = self._mediaPlayer.duration()
 
@@ -806,58 +1501,68 @@ class FullImage(QGraphicsView):
 
     def _drawVideoUi(self) -> None:
         if self._durationGraphicsPolygonItem is not None and self._positionGraphicsLineItem is not None and self._videoLength > 0:
-            # Get the x start position of the duration rect in view coordinates
-            durationXStart = VIDEO_UI_MARGIN
+            # Store whether the view has changed since the UI was last drawn
+            viewChanged = self._videoUiDirty
 
-            # Get the x end position of the duration rect in view coordinates
-            durationWidth = self.width() - VIDEO_UI_MARGIN - durationXStart
+            # Only recalculate the duration polygon if the view has changed
+            if viewChanged:
+                # Get the x start position of the duration rect in view coordinates
+                self._durationXStart = VIDEO_UI_MARGIN
 
-            # Get the y position of the duration rect in view coordinates
-            durationYStart = self.height() - VIDEO_UI_MARGIN - VIDEO_POSITION_LINE_SIZE
+                # Get the x end position of the duration rect in view coordinates
+                self._durationWidth = self.width() - VIDEO_UI_MARGIN - self._durationXStart
 
-            # Get the y position of the duration rect in view coordinates
-            durationHeight = self.height() - VIDEO_UI_MARGIN + VIDEO_POSITION_LINE_SIZE - durationYStart
+                # Get the y position of the duration rect in view coordinates
+                self._durationYStart = self.height() - VIDEO_UI_MARGIN - VIDEO_POSITION_LINE_SIZE
 
-            # Create the duration rect in view coordinates
-            durationViewRect = QRect(durationXStart, durationYStart, durationWidth, durationHeight)
+                # Get the y position of the duration rect in view coordinates
+                durationHeight = self.height() - VIDEO_UI_MARGIN + VIDEO_POSITION_LINE_SIZE - self._durationYStart
 
-            # Map the duration rect to scene coordinates, results in a polygon
-            durationScenePolygon = self.mapToScene(durationViewRect)
+                # Create the duration rect in view coordinates
+                durationViewRect = QRect(self._durationXStart, self._durationYStart, self._durationWidth, durationHeight)
 
-            # Get the x position of the position line
-            positionXPos = int((durationWidth * (self._currentPosition / self._videoLength)) + durationXStart)
+                # Map the duration rect to scene coordinates, results in a polygon
+                durationScenePolygon = self.mapToScene(durationViewRect)
 
-            # Get the starting y position of the position line, plus 1 to account for no polygon outline
-            positionYStart = durationYStart + 1
+                # Set the duration graphics polygon item
+                self._durationGraphicsPolygonItem.setPolygon(durationScenePolygon)
 
-            # Get the ending y position of the position line, plus 1 to account for no polygon outline
-            positionYEnd = positionYStart + VIDEO_POSITION_LINE_SIZE + 1
+                # Get the starting y position of the position line, plus 1 to account for no polygon outline
+                positionYStart = self._durationYStart + 1
 
-            # Create the position start and end points in view coordinations
-            positionStartPoint = QPoint(positionXPos, positionYStart)
-            positionEndPoint = QPoint(positionXPos, positionYEnd)
+                # Get the ending y position of the position line, plus 1 to account for no polygon outline
+                positionYEnd = positionYStart + VIDEO_POSITION_LINE_SIZE + 1
 
-            # Create the position start and end points in scene coordinations
-            scenePositionStartPoint = self.mapToScene(positionStartPoint)
-            scenePositionEndPoint = self.mapToScene(positionEndPoint)
+                # Map the ends of the position line at the start and end of the duration rect to scene coordinates,
+                # the view is only ever scaled and scrolled so positions in between can be interpolated
+                scenePositionStartPoint = self.mapToScene(QPoint(self._durationXStart, positionYStart))
+                scenePositionEndPoint = self.mapToScene(QPoint(self._durationXStart + self._durationWidth, positionYEnd))
 
-            # Create the position line
-            positionLine = QLineF(scenePositionStartPoint, scenePositionEndPoint)
+                # Store the scene coordinates of the position line
+                self._scenePositionXStart = scenePositionStartPoint.x()
+                self._scenePositionXScale = (scenePositionEndPoint.x() - scenePositionStartPoint.x()) / max(self._durationWidth, 1)
+                self._scenePositionYStart = scenePositionStartPoint.y()
+                self._scenePositionYEnd = scenePositionEndPoint.y()
 
-            # Set the duration graphics polygon item
-            self._durationGraphicsPolygonItem.setPolygon(durationScenePolygon)
+                # The geometry is now up to date
+                self._videoUiDirty = False
 
-            # Set the border to transparent
-            self._durationGraphicsPolygonItem.setPen(Qt.PenStyle.NoPen)
+            # Get the x position of the position line
+            positionXPos = int((self._durationWidth * (self._currentPosition / self._videoLength)) + self._durationXStart)
 
-            # Set the fill to dodger blue
-            self._durationGraphicsPolygonItem.setBrush(DODGER_BLUE_50PC)
+            # Only update the position line if it has moved by a pixel or the view has changed
+            if viewChanged or positionXPos != self._videoUiPositionXPos:
+                # Get the x position of the position line in scene coordinates
+                scenePositionXPos = self._scenePositionXStart + (positionXPos - self._durationXStart) * self._scenePositionXScale
 
-            # Set the position graphics line item
-            self._positionGraphicsLineItem.setLine(positionLine)
+                # Create the position line
+                positionLine = QLineF(scenePositionXPos, self._scenePositionYStart, scenePositionXPos, self._scenePositionYEnd)
 
-            # Set the line to white
-            self._positionGraphicsLineItem.setPen(QColor(Qt.GlobalColor.white))
+                # Set the position graphics line item
+                self._positionGraphicsLineItem.setLine(positionLine)
+
+            # Store where the position line was drawn
+            self._videoUiPositionXPos = positionXPos
 
     def _videoUiTimerExpired(self) -> None:
         if self._durationGraphicsPolygonItem is not None and self._positionGraphicsLineItem is not None and self._videoUiTimer is not None:
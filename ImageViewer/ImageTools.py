@@ -1,12 +1,31 @@
-from typing import Callable
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Optional
 import logging
+import struct
+import zlib
 
-from PIL import Image, ImageFilter, ImageEnhance
+from PIL import Image, ImageFilter, ImageEnhance, ImageStat
 from PIL.ImageFilter import Filter
 from PIL import ImageOps
 
-import numpy as np
-from cv2 import dnn_superres, cvtColor, fastNlMeansDenoisingColored, COLOR_RGB2BGR, COLOR_BGR2RGB
+from ImageViewer.Constants import UNDO_COMPRESSION_LEVEL
+
+# An image as stored in the undo buffer, the mode, size, palette, transparency, file format and its description and compressed pixel data
+CompressedImage = tuple[str, tuple[int, int], Optional[list[int]], Any, Optional[str], Optional[str], bytes]
+
+def NativeMode(inputImage: Image.Image) -> Image.Image:
+    # Images in greyscale, RGB or RGBA can be filtered and shown by Qt as they are
+    if inputImage.mode in ('L', 'RGB', 'RGBA'):
+        return inputImage
+
+    # Convert bilevel images to greyscale
+    if inputImage.mode == '1':
+        return inputImage.convert('L')
+
+    # Convert anything else, e.g. palette or CMYK images, to RGB or RGBA depending on whether it has transparency
+    hasAlpha = any(band in ('A', 'a') for band in inputImage.getbands()) or 'transparency' in inputImage.info
+    return inputImage.convert('RGBA' if hasAlpha else 'RGB')
 
 def _ManipulateImage(inputImage: Image.Image, filter: Filter | Callable[[], Filter]) -> Image.Image:
     # Manipulate the image
@@ -73,18 +92,134 @@ def Brightness(inputImage: Image.Image, factor: float) -> Image.Image:
     # Manipulate the image
     return enhance.enhance(factor)
 
+def _Float32(value: float) -> float:
+    # Round a value to single precision
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+def _Blend(first: int, second: int, factor: float) -> int:
+    # Blend two values in the same way as Image.blend, which works in single precision, truncating and clipping the result
+    value = _Float32(first + _Float32(_Float32(factor) * (second - first)))
+    return min(max(int(value), 0), 255)
+
+def ColourEnhancer(inputImage: Image.Image) -> ImageEnhance.Color:
+    # Create the colour enhancement tool, this converts the image to greyscale so can be reused when adjusting the same image repeatedly
+    return ImageEnhance.Color(inputImage)
+
+def Adjust(inputImage: Image.Image, colour: float, contrast: float, brightness: float, colourEnhancer: Optional[ImageEnhance.Color] = None) -> Image.Image:
+    if colour == 1.0:
+        # A colour factor of 1 leaves the image unchanged so skip the pass
+        colouredImage = inputImage
+    else:
+        # Create the colour enhancement tool if one has not been given
+        if colourEnhancer is None:
+            colourEnhancer = ColourEnhancer(inputImage)
+
+        # Colour mixes the channels so has to be applied on its own
+        colouredImage = colourEnhancer.enhance(colour)
+
+    # Apply the contrast and brightness together
+    return ContrastBrightness(colouredImage, contrast, brightness)
+
+def ContrastBrightness(inputImage: Image.Image, contrast: float, brightness: float) -> Image.Image:
+    # Factors of 1 leave the image unchanged so skip the pass
+    if contrast == 1.0 and brightness == 1.0:
+        return inputImage
+
+    # Only modes where the contrast grey matches the mean in every colour band can use the lookup table
+    if inputImage.mode not in ('L', 'RGB', 'RGBA'):
+        return Brightness(Contrast(inputImage, contrast), brightness)
+
+    # Contrast blends each band towards the mean grey level, in the same way as ImageEnhance.Contrast
+    mean = int(ImageStat.Stat(inputImage.convert('L')).mean[0] + 0.5)
+
+    # Contrast and brightness are point operations, so combine them into a single lookup table rather than making two passes over the image
+    table = [_Blend(0, _Blend(mean, value, contrast), brightness) for value in range(256)]
+
+    # Use the table for each colour band, leaving any alpha band unchanged
+    return inputImage.point([entry for band in inputImage.getbands() for entry in (range(256) if band == 'A' else table)])
+
 def Denoise(inputImage: Image.Image) -> Image.Image:
+    # OpenCV and NumPy take a noticeable time to import, so only import them when they are first needed rather than at startup
+    import numpy as np
+    from cv2 import ocl, UMat, cvtColor, fastNlMeansDenoisingColored, COLOR_RGB2BGR, COLOR_BGR2RGB
+
     # Convert the Pillow image to an OpenCV image
     opencvImage = cvtColor(np.array(inputImage), COLOR_RGB2BGR)
 
-    # Denoise the image
-    denoisedImage = fastNlMeansDenoisingColored(opencvImage, None, 3, 3, 7, 21)  # type: ignore
+    if ocl.haveOpenCL():
+        # Denoise the image on the GPU, passing it in as a UMat lets OpenCV use OpenCL
+        denoisedImage = fastNlMeansDenoisingColored(UMat(opencvImage), None, 3, 3, 7, 21).get()  # type: ignore
+    else:
+        # Denoise the image
+        denoisedImage = fastNlMeansDenoisingColored(opencvImage, None, 3, 3, 7, 21)  # type: ignore
 
     # Convert the OpenCV image to a Pillow image
     return Image.fromarray(cvtColor(denoisedImage, COLOR_BGR2RGB))
 
+# The filters which take only an image, keyed by name
+FILTERS = MappingProxyType({
+    'Sharpen': Sharpen,
+    'Blur': Blur,
+    'Contour': Contour,
+    'Detail': Detail,
+    'EdgeEnhance': EdgeEnhance,
+    'Emboss': Emboss,
+    'FindEdges': FindEdges,
+    'Smooth': Smooth,
+    'UnsharpMask': UnsharpMask,
+    'AutoContrast': AutoContrast,
+    'Denoise': Denoise,
+})
+
+# The adjustments which take an image and a factor, keyed by name
+ADJUSTMENTS = MappingProxyType({
+    'Colour': Colour,
+    'Contrast': Contrast,
+    'Brightness': Brightness,
+})
+
+def ApplyAdjustments(inputImage: Image.Image, adjustments: tuple[tuple[str, Optional[float]], ...]) -> Image.Image:
+    # Apply each named adjustment with its factor in turn, a step without a factor is a named filter
+    index = 0
+
+    while index < len(adjustments):
+        name, factor = adjustments[index]
+
+        if name == 'Contrast' and index + 1 < len(adjustments) and adjustments[index + 1][0] == 'Brightness':
+            # Apply a contrast step followed by a brightness step in a single pass over the image, the lookup table blends
+            # in single precision like Image.blend so the result matches making the two steps separately
+            inputImage = ContrastBrightness(inputImage, factor, adjustments[index + 1][1])
+            index += 2
+        elif factor is None:
+            inputImage = FILTERS[name](inputImage)
+            index += 1
+        else:
+            inputImage = ADJUSTMENTS[name](inputImage, factor)
+            index += 1
+
+    return inputImage
+
+@lru_cache(maxsize=1)
+def _DnnDevice() -> tuple[int, int]:
+    # Import OpenCV when it is first needed
+    from cv2 import dnn, cuda, ocl
+
+    if cuda.getCudaEnabledDeviceCount() > 0:
+        # Use CUDA if OpenCV has been built with it and there is a device
+        return dnn.DNN_BACKEND_CUDA, dnn.DNN_TARGET_CUDA
+    elif ocl.haveOpenCL():
+        # Otherwise use OpenCL, which covers most other GPUs
+        return dnn.DNN_BACKEND_OPENCV, dnn.DNN_TARGET_OPENCL
+    else:
+        # Fall back to the CPU
+        return dnn.DNN_BACKEND_OPENCV, dnn.DNN_TARGET_CPU
+
 def SuperResolution(inputImage: Image.Image, factor: int) -> Image.Image:
     if factor >= 2 and factor <= 4:
+        # Import OpenCV and NumPy when they are first needed
+        import numpy as np
+        from cv2 import dnn_superres, cvtColor, COLOR_RGB2BGR, COLOR_BGR2RGB
+
         # Create the super resolution object
         sr = dnn_superres.DnnSuperResImpl_create()
 
@@ -100,6 +235,11 @@ def SuperResolution(inputImage: Image.Image, factor: int) -> Image.Image:
         # Set the model to use
         sr.setModel('fsrcnn', factor)
 
+        # Run the model on the GPU if OpenCV can use one
+        backend, target = _DnnDevice()
+        sr.setPreferableBackend(backend)
+        sr.setPreferableTarget(target)
+
         # Upscale the image
         upscaledImage = sr.upsample(opencvImage)
 
@@ -111,3 +251,35 @@ def SuperResolution(inputImage: Image.Image, factor: int) -> Image.Image:
 
         # Return the original image
         return inputImage
+
+def CompressImage(inputImage: Image.Image) -> CompressedImage:
+    # Losslessly compress the raw pixel data so the undo buffer holds far less than the full images
+    return (
+        inputImage.mode,
+        inputImage.size,
+        inputImage.getpalette(),
+        inputImage.info.get('transparency'),
+        inputImage.format,
+        inputImage.format_description,
+        zlib.compress(inputImage.tobytes(), UNDO_COMPRESSION_LEVEL),
+    )
+
+def DecompressImage(compressedImage: CompressedImage) -> Image.Image:
+    mode, size, palette, transparency, fileFormat, formatDescription, data = compressedImage
+
+    # Rebuild the image from the decompressed pixel data
+    outputImage = Image.frombytes(mode, size, zlib.decompress(data))
+
+    # Restore the palette of palette based images
+    if palette is not None:
+        outputImage.putpalette(palette)
+
+    # Restore the transparent colour, without this palette and greyscale images lose their transparency on the next change
+    if transparency is not None:
+        outputImage.info['transparency'] = transparency
+
+    # Restore the file format so the image information still shows it
+    outputImage.format = fileFormat
+    outputImage.format_description = formatDescription
+
+    return outputImage
@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import Optional
+import logging
+import os
+
+# Number of bytes to read from the start of a file, enough to cover every signature below
+HEADER_SIZE = 16
+
+# Table of (offset, signature, format) used to identify a file from its header
+SIGNATURES: tuple[tuple[int, bytes, str], ...] = (
+    (0, b'\xFF\xD8\xFF', 'jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'png'),
+    (0, b'GIF87a', 'gif'),
+    (0, b'GIF89a', 'gif'),
+    (0, b'RIFF', 'riff'),
+    (4, b'ftyp', 'mp4'),
+    (0, b'\x1aE\xdf\xa3', 'mkv'),
+)
+
+# RIFF is only a container, the format is given by the four bytes at offset 8
+RIFF_SUBTYPES = {
+    b'WEBP': 'webp',
+}
+
+# Index the signatures by offset and first byte when the module is imported so each
+# header only needs to be compared against the signatures that could possibly match
+_SIGNATURE_INDEX: dict[tuple[int, int], list[tuple[bytes, str]]] = {}
+
+for _offset, _signature, _format in SIGNATURES:
+    _SIGNATURE_INDEX.setdefault((_offset, _signature[0]), []).append((_signature, _format))
+
+# The offsets to check, in the order they appear in the table
+_OFFSETS = tuple(dict.fromkeys(offset for offset, _, _ in SIGNATURES))
+
+# The formats that can be decoded as still images
+IMAGE_FORMATS = frozenset({'jpeg', 'png', 'gif', 'webp'})
+
+# The formats that can be played as videos
+VIDEO_FORMATS = frozenset({'mp4', 'mkv'})
+
+def Sniff(path: Path) -> Optional[str]:
+    try:
+        # Read just the header rather than letting a decoder open the whole file
+        fd = os.open(path, os.O_RDONLY)
+
+        try:
+            header = os.read(fd, HEADER_SIZE)
+        finally:
+            os.close(fd)
+    except OSError as error:
+        # Log the error and indicate that the format is unknown
+        logging.log(logging.DEBUG, f'Could not read header of {path}: {error}')
+        return None
+
+    for offset in _OFFSETS:
+        # Ignore offsets beyond the end of a short file
+        if offset >= len(header):
+            continue
+
+        # Return the format of the first candidate signature that matches
+        for signature, format in _SIGNATURE_INDEX.get((offset, header[offset]), ()):
+            if header.startswith(signature, offset):
+                if format == 'riff':
+                    # Look up the actual format stored in the RIFF container
+                    return RIFF_SUBTYPES.get(header[8:12])
+
+                return format
+
+    # No signature matched
+    return None
@@ -1,15 +1,31 @@
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Optional, cast
 import logging
 
 from PySide6.QtWidgets import QMainWindow, QScrollArea, QGridLayout, QWidget, QStackedWidget
 from PySide6.QtGui import QKeyEvent, QResizeEvent, QMouseEvent, QKeySequence, QAction
-from PySide6.QtCore import Qt, Signal, QTimer, QObject, QEvent, QKeyCombination
+from PySide6.QtCore import Qt, Signal, QTimer, QObject, QEvent, QKeyCombination, QDir
 
 from ImageViewer.Thumbnail import Thumbnail
 from ImageViewer.FullImage import FullImage
-from ImageViewer.Constants import START_X, START_Y, START_WIDTH, START_HEIGHT, MIN_WIDTH, SUPPORTED_EXTENSIONS
+from ImageViewer.Constants import START_X, START_Y, START_WIDTH, START_HEIGHT, MIN_WIDTH, QT_NAME_FILTERS, SUPPORTED_EXT_SET
+
+# The filter menu items, each with its menu text, the key used with Option as its shortcut and its name in ImageTools.FILTERS
+FILTER_MENU_ITEMS = (
+    ('Sharpen', Qt.Key.Key_S, 'Sharpen'),
+    ('Blur', Qt.Key.Key_B, 'Blur'),
+    ('Contour', Qt.Key.Key_C, 'Contour'),
+    ('Detail', Qt.Key.Key_D, 'Detail'),
+    ('Edge Enhance', Qt.Key.Key_E, 'EdgeEnhance'),
+    ('Emboss', Qt.Key.Key_M, 'Emboss'),
+    ('Find Edges', Qt.Key.Key_F, 'FindEdges'),
+    ('Smooth', Qt.Key.Key_O, 'Smooth'),
+    ('Unsharp Mask', Qt.Key.Key_U, 'UnsharpMask'),
+    ('Auto Contrast', Qt.Key.Key_A, 'AutoContrast'),
+    ('Denoise', Qt.Key.Key_N, 'Denoise'),
+)
 
 @dataclass
 class FolderInfo:
@@ -151,21 +167,15 @@ class MainWindow(QMainWindow):
         self._decreaseBrightnessAction = self._imageMenu.addAction('Decrease Brightness', QKeyCombination(Qt.Modifier.CTRL, Qt.Key.Key_Left), self._fullSizeImage.DecreaseBrightness)
         self._blackAndWhite = self._imageMenu.addAction('Black and White', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_W), self._fullSizeImage.BlackAndWhite)
         self._imageMenu.addSeparator()
-        self._sharpenAction = self._imageMenu.addAction('Sharpen', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_S), self._fullSizeImage.Sharpen)
-        self._blurAction = self._imageMenu.addAction('Blur', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_B), self._fullSizeImage.Blur)
-        self._contourAction = self._imageMenu.addAction('Contour', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_C), self._fullSizeImage.Contour)
-        self._detailAction = self._imageMenu.addAction('Detail', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_D), self._fullSizeImage.Detail)
-        self._edgeEnhanceAction = self._imageMenu.addAction('Edge Enhance', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_E), self._fullSizeImage.EdgeEnhance)
-        self._embossAction = self._imageMenu.addAction('Emboss', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_M), self._fullSizeImage.Emboss)
-        self._findEdgesAction = self._imageMenu.addAction('Find Edges', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_F), self._fullSizeImage.FindEdges)
-        self._smoothAction = self._imageMenu.addAction('Smooth', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_O), self._fullSizeImage.Smooth)
-        self._unsharpMaskAction = self._imageMenu.addAction('Unsharp Mask', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_U), self._fullSizeImage.UnsharpMask)
-        self._autoContrastAction = self._imageMenu.addAction('Auto Contrast', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_A), self._fullSizeImage.AutoContrast)
-        self._denoiseAction = self._imageMenu.addAction('Denoise', QKeyCombination(Qt.Modifier.ALT, Qt.Key.Key_N), self._fullSizeImage.Denoise)
+        self._filterActions = [
+            self._imageMenu.addAction(text, QKeyCombination(Qt.Modifier.ALT, key), partial(self._fullSizeImage.ApplyFilter, name))
+            for text, key, name in FILTER_MENU_ITEMS
+        ]
         self._imageMenu.addSeparator()
         self._superResolutionAction = self._imageMenu.addAction('Super Resolution', QKeyCombination(Qt.Modifier.META, Qt.Key.Key_S), self._fullSizeImage.SuperResolution)
         self._imageMenu.addSeparator()
         self._undoAction = self._imageMenu.addAction('Undo', QKeySequence.StandardKey.Undo, self._fullSizeImage.UndoLastChange)
+        self._redoAction = self._imageMenu.addAction('Redo', QKeySequence.StandardKey.Redo, self._fullSizeImage.RedoLastChange)
 
         # Add actions to the video menu
         self._playPauseAction = self._videoMenu.addAction('Play / Pause', QKeySequence(Qt.Key.Key_Space), self._fullSizeImage.PlayPause)
@@ -182,6 +192,7 @@ class MainWindow(QMainWindow):
             isinstance(self._cropAction, QAction) and
             isinstance(self._saveAction, QAction) and
             isinstance(self._undoAction, QAction) and
+            isinstance(self._redoAction, QAction) and
             isinstance(self._adjustImageAction, QAction) and
             isinstance(self._imageInfoAction, QAction) and
             isinstance(self._increaseColourAction, QAction) and
@@ -191,17 +202,7 @@ class MainWindow(QMainWindow):
             isinstance(self._increaseBrightnessAction, QAction) and
             isinstance(self._decreaseBrightnessAction, QAction) and
             isinstance(self._blackAndWhite, QAction) and
-            isinstance(self._sharpenAction, QAction) and
-            isinstance(self._blurAction, QAction) and
-            isinstance(self._contourAction, QAction) and
-            isinstance(self._detailAction, QAction) and
-            isinstance(self._edgeEnhanceAction, QAction) and
-            isinstance(self._embossAction, QAction) and
-            isinstance(self._findEdgesAction, QAction) and
-            isinstance(self._smoothAction, QAction) and
-            isinstance(self._unsharpMaskAction, QAction) and
-            isinstance(self._autoContrastAction, QAction) and
-            isinstance(self._denoiseAction, QAction) and
+            all(isinstance(action, QAction) for action in self._filterActions) and
             isinstance(self._superResolutionAction, QAction) and
             isinstance(self._playPauseAction, QAction) and
             isinstance(self._skipForwardsAction, QAction) and
@@ -215,6 +216,7 @@ class MainWindow(QMainWindow):
             self._fullSizeImage.canCropToRectSignal.connect(self._cropAction.setEnabled)
             self._fullSizeImage.imageModifiedSignal.connect(self._saveAction.setEnabled)
             self._fullSizeImage.imageModifiedSignal.connect(self._undoAction.setEnabled)
+            self._fullSizeImage.canRedoSignal.connect(self._redoAction.setEnabled)
 
             # Connect signals to enable menu items if an image is loaded rather than an video
             self._fullSizeImage.imageLoadedSignal.connect(self._adjustImageAction.setEnabled)
@@ -226,19 +228,12 @@ class MainWindow(QMainWindow):
             self._fullSizeImage.imageLoadedSignal.connect(self._increaseBrightnessAction.setEnabled)
             self._fullSizeImage.imageLoadedSignal.connect(self._decreaseBrightnessAction.setEnabled)
             self._fullSizeImage.imageLoadedSignal.connect(self._blackAndWhite.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._sharpenAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._blurAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._contourAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._detailAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._edgeEnhanceAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._embossAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._findEdgesAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._smoothAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._unsharpMaskAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._autoContrastAction.setEnabled)
-            self._fullSizeImage.imageLoadedSignal.connect(self._denoiseAction.setEnabled)
             self._fullSizeImage.imageLoadedSignal.connect(self._superResolutionAction.setEnabled)
 
+            # Connect signals to enable the filters if an image is loaded rather than a video
+            for action in self._filterActions:
+                self._fullSizeImage.imageLoadedSignal.connect(action.setEnabled)
+
             # Connect signals to enable menu items if an image is loaded rather than an video
             self._fullSizeImage.videoLoadedSignal.connect(self._playPauseAction.setEnabled)
             self._fullSizeImage.videoLoadedSignal.connect(self._skipForwardsAction.setEnabled)
@@ -261,19 +256,21 @@ class MainWindow(QMainWindow):
             self._imageMenu.setEnabled(True)
             self._videoMenu.setEnabled(True)
 
-            # Disable the reset zoom, rect related and undo actions
+            # Disable the reset zoom, rect related, undo and redo actions
             if (
                 isinstance(self._resetZoomAction, QAction) and
                 isinstance(self._zoomAction, QAction) and
                 isinstance(self._cropAction, QAction) and
                 isinstance(self._saveAction, QAction) and
-                isinstance(self._undoAction, QAction)
+                isinstance(self._undoAction, QAction) and
+                isinstance(self._redoAction, QAction)
             ):
                 self._resetZoomAction.setEnabled(False)
                 self._zoomAction.setEnabled(False)
                 self._cropAction.setEnabled(False)
                 self._saveAction.setEnabled(False)
                 self._undoAction.setEnabled(False)
+                self._redoAction.setEnabled(False)
         else:
             # Disable the menus
             self._fileMenu.setEnabled(False)
@@ -297,8 +294,11 @@ class MainWindow(QMainWindow):
                 self.setWindowTitle(title[:-2])
 
     def _GetImagePathList(self) -> list[Path]:
-        # Return the list of images Paths, sorted alphabetically (case insensitive)
-        return sorted([image for image in self._currentPath.iterdir() if image.suffix.lower() in SUPPORTED_EXTENSIONS.values()], key=lambda x: x.name.lower())
+        # Let Qt filter the folder down to the supported files, including hidden ones as the file walk did, and sort them alphabetically (case insensitive)
+        imageNames = QDir(self._currentPath.as_posix()).entryList(list(QT_NAME_FILTERS), QDir.Filter.Files | QDir.Filter.Hidden, QDir.SortFlag.Name | QDir.SortFlag.IgnoreCase)
+
+        # Return the list of images Paths
+        return [self._currentPath / imageName for imageName in imageNames]
 
     def _GetFolderList(self) -> list[Path]:
         # Get the list of non-hidden folders in this folder
@@ -435,8 +435,11 @@ class MainWindow(QMainWindow):
         # Initialise the file browser to the parent path
         self.SetLabels()
 
-        # Show the selected image maximised
-        self.ShowImage(imagePath)
+        # Show the selected image maximised if it is a supported type found in the folder, otherwise just show the browser
+        if imagePath.suffix.casefold() in SUPPORTED_EXT_SET and imagePath in self._imageList:
+            self.ShowImage(imagePath)
+        else:
+            logging.log(logging.INFO, f'Wnd: Unsupported file type opened: {imagePath}')
 
     def StartUpTimerExpired(self) -> None:
         # Log the the timeout has expired
@@ -26,7 +26,9 @@ from PIL.ImageQt import ImageQt
 # This seems to be necessary to ensure webp images can be loaded at startup
 import PIL.WebPImagePlugin as _
 
-from ImageViewer.Constants import DODGER_BLUE, DODGER_BLUE_50PC, VIDEO_EXTENSIONS
+from ImageViewer.Constants import ExtensionKind
+from ImageViewer.Colours import DODGER_BLUE, DODGER_BLUE_50PC
+import ImageViewer.MagicBytes as MagicBytes
 
 class PixmapLabel(QLabel):
     def __init__(self):
@@ -236,7 +238,7 @@ class Thumbnail(QWidget):
     def SetDefaultImage(self) -> None:
         if self.ImagePath.is_file():
             if self._defaultImage and self._videoImage:
-                if self.ImagePath.suffix in VIDEO_EXTENSIONS.values():
+                if ExtensionKind(self.ImagePath.suffix) == 'video':
                     # if this is a folder, set the folder image
                     videoPixmap = QPixmap()
                     videoPixmap.convertFromImage(self._videoImage)
@@ -301,20 +303,25 @@ class Thumbnail(QWidget):
             # Log that the image load has started
             logging.log(logging.DEBUG, f'Loading Image {self.ImagePath}')
 
-            # Use Pillow to open the image and convert to a QPixmap
-            pilImage = Image.open(self.ImagePath)
+            # Check the file header before handing it to a decoder, skipping files which are not really images
+            if MagicBytes.Sniff(self.ImagePath) not in MagicBytes.IMAGE_FORMATS:
+                # Log that the file has been skipped, it is shown with the fallback icon below
+                logging.log(logging.WARNING, f'Skipping {self.ImagePath}, contents do not match an image format')
+            else:
+                # Use Pillow to open the image and convert to a QPixmap
+                pilImage = Image.open(self.ImagePath)
 
-            # Scale the in memory image
-            pilImage.thumbnail((self._scaledImageSize, self._scaledImageSize))
+                # Scale the in memory image
+                pilImage.thumbnail((self._scaledImageSize, self._scaledImageSize))
 
-            # Log that PIL the image load has completed
-            logging.log(logging.DEBUG, f'PIL Loaded {self.ImagePath}')
+                # Log that PIL the image load has completed
+                logging.log(logging.DEBUG, f'PIL Loaded {self.ImagePath}')
 
-            # Convert the PIL image to a QImage
-            self._qtImage = ImageQt(pilImage)
+                # Convert the PIL image to a QImage
+                self._qtImage = ImageQt(pilImage)
 
-            # Log that the QImage conversion has completed
-            logging.log(logging.DEBUG, f'Qt Converted {self.ImagePath}')
+                # Log that the QImage conversion has completed
+                logging.log(logging.DEBUG, f'Qt Converted {self.ImagePath}')
 
         # Check that the load has not yet been cancelled
         if not self._loadCancelled: